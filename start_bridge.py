@@ -1,17 +1,26 @@
 import asyncio
+import errno
 import websockets
 import json
+import orjson
+from collections import OrderedDict
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from itertools import count
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
+import aiofiles
+import aiofiles.os
 import aiohttp
 from aiohttp import web
+from multidict import CIMultiDict, CIMultiDictProxy
+import numpy as np
 import socketio
-import socket
+import ssl
 import sys
 import os
 import re
+import signal
 import time
 
 # Configure logging
@@ -21,6 +30,38 @@ logger = logging.getLogger(__name__)
 # Funscript conversion constants
 FAKTOR_CONV = 6.25
 
+# CORS headers added to every response
+CORS_HEADERS = CIMultiDictProxy(CIMultiDict([
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', 'GET, POST, OPTIONS'),
+    ('Access-Control-Allow-Headers', 'Content-Type'),
+]))
+
+# Hosts the image proxy is allowed to fetch from
+ALLOWED_PROXY_HOSTS = frozenset(('transform.gammacdn.com', 'cdn.adulttime.com'))
+
+# Base vibration strength for each scene intensity level
+SCENE_INTENSITY = {
+    "low": 0.3,
+    "medium": 0.6,
+    "high": 0.9,
+    "climax": 1.0
+}
+
+def format_speed(value: float) -> str:
+    """Quantize a 0-1 value to 1/127 steps and format it compactly"""
+    return f"{round(value * 127) / 127:.4f}".rstrip('0').rstrip('.')
+
+# Encoders for the high-rate Buttplug device commands. The message layout is
+# fixed, so the JSON is built from a compiled f-string instead of json/orjson.
+def encode_vibrate(msg_id: int, device_id: int, speed: float) -> str:
+    """Encode a single-motor VibrateCmd message"""
+    return f'{{"VibrateCmd":{{"Id":{msg_id},"DeviceIndex":{device_id},"Speeds":[{{"Index":0,"Speed":{format_speed(speed)}}}]}}}}'
+
+def encode_linear(msg_id: int, device_id: int, duration: int, position: float) -> str:
+    """Encode a single-axis LinearCmd message"""
+    return f'{{"LinearCmd":{{"Id":{msg_id},"DeviceIndex":{device_id},"Vectors":[{{"Index":0,"Duration":{duration},"Position":{format_speed(position)}}}]}}}}'
+
 def load_config(config_file: str = "config.json") -> dict:
     """Load configuration from JSON file"""
     try:
@@ -34,21 +75,24 @@ def load_config(config_file: str = "config.json") -> dict:
         logger.error(f"Failed to load config: {e}")
         return {}
 
-def check_port_available(host: str, port: int) -> bool:
-    """Check if a port is available for binding"""
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            s.bind((host, port))
-            return True
-    except OSError:
-        return False
-
-def find_available_port(host: str, start_port: int, max_attempts: int = 10) -> int:
-    """Find an available port starting from start_port"""
-    for port in range(start_port, start_port + max_attempts):
-        if check_port_available(host, port):
+def json_response(data, status: int = 200) -> web.Response:
+    """Build a JSON response serialized with orjson"""
+    return web.Response(body=orjson.dumps(data), status=status, content_type='application/json')
+
+async def start_site(runner: web.AppRunner, host: str, start_port: int, max_attempts: int = 10) -> int:
+    """Bind a TCP site on start_port, falling back to the following ports"""
+    for port in range(start_port, start_port + max_attempts + 1):
+        site = web.TCPSite(runner, host, port)
+        try:
+            await site.start()
             return port
+        except OSError as e:
+            # Unregister the failed site so the runner only tracks the one that bound
+            await site.stop()
+            # Only a busy port is worth retrying; e.g. an unresolvable host fails the same way everywhere
+            if e.errno != errno.EADDRINUSE:
+                raise
+            logger.warning(f"Port {port} is already in use")
     raise RuntimeError(f"Could not find available port starting from {start_port}")
 
 class ButtplugConnector:
@@ -59,14 +103,20 @@ class ButtplugConnector:
         self.websocket = None
         self.devices = {}
         self.connected = False
-        self.message_id = 10  # Start message IDs from 10
+        self._message_ids = count(11)  # Message IDs start after the reserved handshake/scan IDs
+        self._send_q = asyncio.Queue()
+        self._writer_task = None
+        self._connect_lock = asyncio.Lock()
+        # Bumped whenever device state may have been reset (reconnect, device changes, dropped sends)
+        self.generation = 0
 
     async def connect(self):
         """Connect to Buttplug server"""
+        websocket = None
         try:
-            # Set a timeout for the connection attempt
-            self.websocket = await asyncio.wait_for(
-                websockets.connect(self.buttplug_url), 
+            # Set a timeout for the connection attempt; keepalive pings are handled by websockets
+            websocket = await asyncio.wait_for(
+                websockets.connect(self.buttplug_url, ping_interval=30, ping_timeout=10), 
                 timeout=5.0
             )
 
@@ -78,31 +128,37 @@ class ButtplugConnector:
                     "MessageVersion": 3
                 }
             }
-            message_json = json.dumps([handshake], ensure_ascii=False, separators=(',', ':'))
+            message_json = orjson.dumps([handshake]).decode()
             logger.debug(f"Sending handshake: {message_json}")
-            await self.websocket.send(message_json)
+            await websocket.send(message_json)
 
             # Receive handshake response with timeout
-            response = json.loads(await asyncio.wait_for(
-                self.websocket.recv(), 
+            response = orjson.loads(await asyncio.wait_for(
+                websocket.recv(), 
                 timeout=5.0
             ))
             logger.info(f"Handshake response: {response}")
 
             # Request device list
             device_list_msg = {"RequestDeviceList": {"Id": 2}}
-            message_json = json.dumps([device_list_msg], ensure_ascii=False, separators=(',', ':'))
+            message_json = orjson.dumps([device_list_msg]).decode()
             logger.debug(f"Sending device list request: {message_json}")
-            await self.websocket.send(message_json)
+            await websocket.send(message_json)
 
+            # Publish the connection only now, so queued commands cannot go out before the handshake
+            previous, self.websocket = self.websocket, websocket
+            if previous is not None:
+                await previous.close()
             self.connected = True
+            self.generation += 1  # Intiface stops all devices when a client disconnects
             logger.info("Connected to Buttplug server")
             
             # Start listening for messages in background
-            asyncio.create_task(self._listen_for_messages())
-            
-            # Start heartbeat to keep connection alive
-            asyncio.create_task(self._heartbeat())
+            asyncio.create_task(self._listen_for_messages(websocket))
+
+            # Start the writer that batches outgoing commands
+            if self._writer_task is None or self._writer_task.done():
+                self._writer_task = asyncio.create_task(self._writer())
 
         except asyncio.TimeoutError:
             logger.warning("Timeout connecting to Buttplug server - make sure Intiface Central is running")
@@ -111,284 +167,462 @@ class ButtplugConnector:
             logger.error(f"Failed to connect to Buttplug: {e}")
             self.connected = False
 
+        # Don't leak a connection whose handshake failed
+        if websocket is not None and self.websocket is not websocket:
+            await websocket.close()
+
+    async def ensure_connected(self):
+        """Connect unless already connected, sharing one attempt between concurrent callers"""
+        async with self._connect_lock:
+            if not self.websocket:
+                await self.connect()
+
     async def scan_devices(self):
         """Start scanning for devices"""
         if not self.connected:
             return
 
-        try:
-            scan_msg = {"StartScanning": {"Id": 3}}
-            message_json = json.dumps([scan_msg], ensure_ascii=False, separators=(',', ':'))
-            logger.debug(f"Sending scan request: {message_json}")
-            await self.websocket.send(message_json)
-            logger.info("Started device scanning")
-        except Exception as e:
-            logger.error(f"Failed to start scanning: {e}")
+        scan_msg = {"StartScanning": {"Id": 3}}
+        logger.debug(f"Queueing scan request: {scan_msg}")
+        self._queue_message(scan_msg)
+        logger.info("Started device scanning")
 
-    async def _heartbeat(self):
-        """Send periodic ping to keep connection alive"""
-        while self.connected and self.websocket:
-            try:
-                await asyncio.sleep(30)  # Send ping every 30 seconds
-                if self.websocket and self.connected:
-                    await self.websocket.ping()
-                    logger.debug("Sent heartbeat ping")
-            except Exception as e:
-                logger.warning(f"Heartbeat failed: {e}")
-                self.connected = False
-                self.websocket = None
-                break
+    def _queue_message(self, msg: dict):
+        """Serialize a Buttplug message and queue it for the writer task"""
+        # Intiface only accepts text frames, so keep the payload as str
+        self._send_q.put_nowait(orjson.dumps(msg).decode())
 
-    async def _listen_for_messages(self):
-        """Listen for incoming messages from Buttplug server"""
-        try:
-            while self.connected and self.websocket:
+    async def _writer(self):
+        """Drain the send queue, merging queued messages into a single frame"""
+        while True:
+            batch = [await self._send_q.get()]
+            while True:
                 try:
-                    message = await asyncio.wait_for(self.websocket.recv(), timeout=1.0)
-                    await self._process_message(message)
-                except asyncio.TimeoutError:
-                    # Normal timeout, continue listening
-                    continue
-                except websockets.exceptions.ConnectionClosed:
-                    logger.warning("Buttplug connection closed, attempting to reconnect...")
+                    batch.append(self._send_q.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            websocket = self.websocket
+            if not websocket:
+                logger.warning(f"Dropping {len(batch)} queued message(s): not connected")
+                self.generation += 1
+                continue
+
+            try:
+                await websocket.send('[' + ','.join(batch) + ']')
+            except Exception as e:
+                logger.error(f"Failed to send {len(batch)} message(s): {e}")
+                self.generation += 1
+                # Leave a connection opened by a concurrent reconnect alone
+                if self.websocket is websocket:
                     self.connected = False
                     self.websocket = None
-                    # Try to reconnect
-                    await asyncio.sleep(2)  # Wait before reconnecting
-                    await self.connect()
-                    break
+                # Try to reconnect on next command
+                logger.info("WebSocket connection lost, will attempt to reconnect on next command")
+
+    async def _listen_for_messages(self, websocket):
+        """Listen for incoming messages on one Buttplug connection"""
+        try:
+            while self.websocket is websocket:
+                message = await websocket.recv()
+                await self._process_message(message)
+        except websockets.exceptions.ConnectionClosed:
+            logger.warning("Buttplug connection closed, attempting to reconnect...")
+            if self.websocket is websocket:
+                self.connected = False
+                self.websocket = None
+            # Try to reconnect, unless another path already has
+            await asyncio.sleep(2)  # Wait before reconnecting
+            await self.ensure_connected()
         except Exception as e:
             logger.error(f"Error in message listener: {e}")
-            self.connected = False
-            self.websocket = None
+            if self.websocket is websocket:
+                self.connected = False
+                self.websocket = None
+
+    def _on_device_added(self, device_info: dict):
+        """Handle a DeviceAdded message"""
+        device_id = device_info["DeviceIndex"]
+        device_name = device_info["DeviceName"]
+        self.devices[device_id] = device_info
+        self.generation += 1
+        logger.info(f"Device added: {device_name} (ID: {device_id})")
+
+    def _on_device_removed(self, device_info: dict):
+        """Handle a DeviceRemoved message"""
+        device_id = device_info["DeviceIndex"]
+        if device_id in self.devices:
+            device_name = self.devices[device_id].get("DeviceName", "Unknown")
+            del self.devices[device_id]
+            self.generation += 1
+            logger.info(f"Device removed: {device_name} (ID: {device_id})")
+
+    def _on_device_list(self, device_list: dict):
+        """Handle a DeviceList message"""
+        for device_info in device_list["Devices"]:
+            device_id = device_info["DeviceIndex"]
+            device_name = device_info["DeviceName"]
+            self.devices[device_id] = device_info
+            logger.info(f"Found existing device: {device_name} (ID: {device_id})")
+
+    # Buttplug message type -> handler; other message types are ignored
+    _MESSAGE_HANDLERS = {
+        "DeviceAdded": _on_device_added,
+        "DeviceRemoved": _on_device_removed,
+        "DeviceList": _on_device_list,
+    }
 
     async def _process_message(self, message: str):
         """Process incoming message from Buttplug server"""
         try:
-            data = json.loads(message)
+            data = orjson.loads(message)
             logger.debug(f"Received message: {data}")
             
             for msg in data:
-                if "DeviceAdded" in msg:
-                    device_info = msg["DeviceAdded"]
-                    device_id = device_info["DeviceIndex"]
-                    device_name = device_info["DeviceName"]
-                    self.devices[device_id] = device_info
-                    logger.info(f"Device added: {device_name} (ID: {device_id})")
-                    
-                elif "DeviceRemoved" in msg:
-                    device_info = msg["DeviceRemoved"]
-                    device_id = device_info["DeviceIndex"]
-                    if device_id in self.devices:
-                        device_name = self.devices[device_id].get("DeviceName", "Unknown")
-                        del self.devices[device_id]
-                        logger.info(f"Device removed: {device_name} (ID: {device_id})")
-                        
-                elif "DeviceList" in msg:
-                    device_list = msg["DeviceList"]["Devices"]
-                    for device_info in device_list:
-                        device_id = device_info["DeviceIndex"]
-                        device_name = device_info["DeviceName"]
-                        self.devices[device_id] = device_info
-                        logger.info(f"Found existing device: {device_name} (ID: {device_id})")
+                for msg_type, payload in msg.items():
+                    handler = self._MESSAGE_HANDLERS.get(msg_type)
+                    if handler:
+                        handler(self, payload)
                         
         except Exception as e:
             logger.error(f"Error processing message: {e}")
 
-    async def vibrate_device(self, device_id: int, strength: float):
-        """Send vibration command to device"""
+    async def vibrate_device(self, device_id: int, strength: float) -> bool:
+        """Send vibration command to device, returning whether it was queued"""
         if not self.websocket or device_id not in self.devices:
             logger.warning(f"Cannot vibrate device {device_id}: websocket_exists={bool(self.websocket)}, device_exists={device_id in self.devices}")
             # Try to reconnect if websocket is missing
             if not self.websocket:
                 logger.info("Attempting to reconnect to Buttplug...")
-                await self.connect()
+                await self.ensure_connected()
                 if not self.websocket or device_id not in self.devices:
-                    return
+                    return False
             else:
-                return
+                return False
 
         # Mark as connected if we have websocket and devices
         if self.websocket and self.devices:
             self.connected = True
 
-        try:
-            self.message_id += 1
-            vibrate_msg = {
-                "VibrateCmd": {
-                    "Id": self.message_id,
-                    "DeviceIndex": device_id,
-                    "Speeds": [{"Index": 0, "Speed": strength}]
-                }
-            }
-            message_json = json.dumps([vibrate_msg], ensure_ascii=False, separators=(',', ':'))
-            await self.websocket.send(message_json)
-            logger.info(f"Sent vibration command: device={device_id}, strength={strength}, msg_id={self.message_id}")
-        except Exception as e:
-            logger.error(f"Failed to send vibration: {e}")
-            self.connected = False
-            self.websocket = None
-            # Try to reconnect on next command
-            logger.info("WebSocket connection lost, will attempt to reconnect on next command")
+        msg_id = next(self._message_ids)
+        self._send_q.put_nowait(encode_vibrate(msg_id, device_id, strength))
+        logger.info(f"Queued vibration command: device={device_id}, strength={strength}, msg_id={msg_id}")
+        return True
 
     async def stroke_device(self, device_id: int, position: float, duration: int):
         """Send stroke command to stroker device"""
         if not self.connected or device_id not in self.devices:
             return
 
-        try:
-            stroke_msg = {
-                "LinearCmd": {
-                    "Id": 0,  # System messages use Id 0
-                    "DeviceIndex": device_id,
-                    "Vectors": [{"Index": 0, "Duration": duration, "Position": position}]
-                }
-            }
-            message_json = json.dumps([stroke_msg], ensure_ascii=False, separators=(',', ':'))
-            await self.websocket.send(message_json)
-            logger.debug(f"Sent stroke command: device={device_id}, position={position}")
-        except Exception as e:
-            logger.error(f"Failed to send stroke: {e}")
+        # System messages use Id 0
+        self._send_q.put_nowait(encode_linear(0, device_id, duration, position))
+        logger.debug(f"Queued stroke command: device={device_id}, position={position}")
 
 class VideoEventProcessor:
     """Processes video events and translates them to device commands"""
 
+    # Strength changes smaller than one device step are not worth sending
+    STRENGTH_EPSILON = 1 / 127
+
+    # Audio-driven levels are sent at most 50 times per second
+    AUDIO_SEND_INTERVAL = 0.02
+
     def __init__(self, buttplug_connector: ButtplugConnector):
         self.buttplug = buttplug_connector
         self.intensity_scale = 1.0
+        self._last_strength = {}  # device_id -> last strength sent
+        self._generation = buttplug_connector.generation  # connector generation _last_strength belongs to
+        self._audio_strength = 0.0  # latest requested audio strength
+        self._audio_pending = asyncio.Event()
+        self._audio_task = None
 
     @property
     def active_devices(self):
         """Get list of active device IDs"""
         return list(self.buttplug.devices.keys())
 
+    async def _vibrate(self, device_id: int, strength: float, force: bool = False):
+        """Send a vibration unless the device is already at this strength"""
+        # Remembered strengths are void once the connector reconnects or its devices change
+        if self._generation != self.buttplug.generation:
+            self._last_strength.clear()
+            self._generation = self.buttplug.generation
+        last = self._last_strength.get(device_id)
+        if not force and last is not None and abs(last - strength) < self.STRENGTH_EPSILON:
+            return
+        if await self.buttplug.vibrate_device(device_id, strength):
+            self._last_strength[device_id] = strength
+
     async def process_play_event(self):
         """Handle video play event"""
         logger.info("Video started playing")
         # Start gentle vibration to indicate connection
-        for device_id in self.active_devices:
-            await self.buttplug.vibrate_device(device_id, 0.2 * self.intensity_scale)
+        strength = 0.2 * self.intensity_scale
+        await asyncio.gather(*(self._vibrate(device_id, strength, force=True) for device_id in self.active_devices))
 
     async def process_pause_event(self):
         """Handle video pause event"""
         logger.info("Video paused")
-        # Stop all vibrations
-        for device_id in self.active_devices:
-            await self.buttplug.vibrate_device(device_id, 0.0)
+        # Stop all vibrations, discarding any audio level not yet sent
+        self._audio_pending.clear()
+        self._last_strength.clear()
+        await asyncio.gather(*(self._vibrate(device_id, 0.0, force=True) for device_id in self.active_devices))
 
     async def process_scene_change(self, scene_intensity: str):
         """Handle scene change events"""
-        intensity_map = {
-            "low": 0.3,
-            "medium": 0.6,
-            "high": 0.9,
-            "climax": 1.0
-        }
-
-        strength = intensity_map.get(scene_intensity, 0.5) * self.intensity_scale
+        strength = SCENE_INTENSITY.get(scene_intensity, 0.5) * self.intensity_scale
         logger.info(f"Scene change: {scene_intensity} -> strength {strength}")
 
-        for device_id in self.active_devices:
-            await self.buttplug.vibrate_device(device_id, strength)
+        await asyncio.gather(*(self._vibrate(device_id, strength) for device_id in self.active_devices))
 
     async def process_audio_level(self, audio_level: float):
         """Process audio level for dynamic response"""
         # Scale audio level to vibration strength
         strength = min(audio_level * 0.8 * self.intensity_scale, 1.0)
 
-        for device_id in self.active_devices:
-            await self.buttplug.vibrate_device(device_id, strength)
+        # Only the newest level matters; the driver task sends it when the link is free
+        self._audio_strength = strength
+        self._audio_pending.set()
+        if self._audio_task is None or self._audio_task.done():
+            self._audio_task = asyncio.create_task(self._audio_driver())
+
+    async def _audio_driver(self):
+        """Send the latest audio level, dropping intermediate ones"""
+        while True:
+            await self._audio_pending.wait()
+            self._audio_pending.clear()
+            strength = self._audio_strength
+            await asyncio.gather(*(self._vibrate(device_id, strength) for device_id in self.active_devices))
+            await asyncio.sleep(self.AUDIO_SEND_INTERVAL)
 
 class FunscriptDownloader:
     """Handles downloading and converting Lovense patterns to funscripts"""
+
+    # Adult Time network sites, matched in a single pass
+    VIDEO_ID_PATTERN = re.compile(
+        r'(?:adulttime\.com|members\.adulttime\.com|switch\.com|howwomenorgasm\.com|'
+        r'getupclose\.com|milfoverload\.net|dareweshare\.net|jerkbuddies\.com|'
+        r'adulttime\.studio|oopsie\.tube|adulttimepilots\.com|kissmefuckme\.net|'
+        r'youngerloverofmine\.com)/.*?/([0-9]+)'
+    )
+
+    # Upper bound on concurrent downloads when fetching several videos
+    MAX_CONCURRENT_DOWNLOADS = 8
+
+    # Seconds before the in-memory cache index is rebuilt from disk
+    CACHE_INDEX_TTL = 5.0
     
     def __init__(self, cache_dir: str = "cache"):
         self.cache_dir = cache_dir
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._download_sem = asyncio.Semaphore(self.MAX_CONCURRENT_DOWNLOADS)
+        self._in_flight: Dict[str, asyncio.Task] = {}
         os.makedirs(cache_dir, exist_ok=True)
+        # Names of cached files, plus mtimes of the .funscript ones, so lookups skip stat() calls
+        self._cached_names, self._funscript_mtimes = self._scan_cache_dir()
+        self._cache_index_ts = time.monotonic()
+        # name -> (present, mtime) for index updates made while a rescan runs
+        self._index_changes: Optional[Dict[str, Tuple[bool, Optional[float]]]] = None
         logger.info(f"Funscript cache directory: {cache_dir}")
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=20)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
     
+    def _scan_cache_dir(self) -> Tuple[set, Dict[str, float]]:
+        """List the cache directory, stat()-ing only the .funscript files"""
+        names = set()
+        funscript_mtimes = {}
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                try:
+                    if not entry.is_file():
+                        continue
+                    if entry.name.endswith('.funscript'):
+                        funscript_mtimes[entry.name] = entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue  # Removed while scanning
+                names.add(entry.name)
+        return names, funscript_mtimes
+
+    async def refresh_cache_index(self, force: bool = False):
+        """Rebuild the cache index in a worker thread once it is stale"""
+        now = time.monotonic()
+        if not force and now - self._cache_index_ts < self.CACHE_INDEX_TTL:
+            return
+        # Claim the refresh up front so concurrent callers don't all rescan
+        self._cache_index_ts = now
+        loop = asyncio.get_running_loop()
+        self._index_changes = changes = {}
+        try:
+            names, mtimes = await loop.run_in_executor(None, self._scan_cache_dir)
+        finally:
+            if self._index_changes is changes:
+                self._index_changes = None
+        # Replay writes and removals that raced the scan onto its result
+        for name, (present, mtime) in changes.items():
+            if present:
+                names.add(name)
+                if mtime is not None:
+                    mtimes[name] = mtime
+            else:
+                names.discard(name)
+                mtimes.pop(name, None)
+        self._cached_names, self._funscript_mtimes = names, mtimes
+
+    async def is_cached(self, name: str) -> bool:
+        """Check whether a file is present in the cache directory"""
+        await self.refresh_cache_index()
+        return name in self._cached_names
+
+    async def cached_mtime(self, name: str) -> Optional[float]:
+        """Get the mtime of a cached .funscript file, or None if it is not cached"""
+        await self.refresh_cache_index()
+        return self._funscript_mtimes.get(name)
+
+    def _forget_cached(self, name: str):
+        """Drop a file from the cache index"""
+        self._cached_names.discard(name)
+        self._funscript_mtimes.pop(name, None)
+        if self._index_changes is not None:
+            self._index_changes[name] = (False, None)
+
+    async def _mark_cached(self, path: str):
+        """Record a freshly written cache file in the index"""
+        name = os.path.basename(path)
+        mtime = None
+        if name.endswith('.funscript'):
+            mtime = (await aiofiles.os.stat(path)).st_mtime
+            self._funscript_mtimes[name] = mtime
+        self._cached_names.add(name)
+        if self._index_changes is not None:
+            self._index_changes[name] = (True, mtime)
+
+    async def _download_to_file(self, url: str, path: str) -> Tuple[int, Optional[bytearray]]:
+        """Download a URL into a cache file, returning the HTTP status and the raw body"""
+        session = await self._get_session()
+        async with session.get(url) as response:
+            if response.status != 200:
+                return response.status, None
+            data = bytearray()
+            async for chunk in response.content.iter_chunked(65536):
+                data += chunk
+        # Write in a worker thread so the event loop never waits on the disk
+        async with aiofiles.open(path, 'wb') as f:
+            await f.write(data)
+        await self._mark_cached(path)
+        return response.status, data
+
+    async def _read_cached(self, name: str) -> bytes:
+        """Read a file from the cache directory as raw bytes"""
+        async with aiofiles.open(os.path.join(self.cache_dir, name), 'rb') as f:
+            return await f.read()
+
     def extract_adulttime_id(self, url: str) -> Optional[str]:
         """Extract video ID from Adult Time URL"""
-        patterns = [
-            r'adulttime\.com/.*?/([0-9]+)',
-            r'members\.adulttime\.com/.*?/([0-9]+)',
-            r'switch\.com/.*?/([0-9]+)',
-            r'howwomenorgasm\.com/.*?/([0-9]+)',
-            r'getupclose\.com/.*?/([0-9]+)',
-            r'milfoverload\.net/.*?/([0-9]+)',
-            r'dareweshare\.net/.*?/([0-9]+)',
-            r'jerkbuddies\.com/.*?/([0-9]+)',
-            r'adulttime\.studio/.*?/([0-9]+)',
-            r'oopsie\.tube/.*?/([0-9]+)',
-            r'adulttimepilots\.com/.*?/([0-9]+)',
-            r'kissmefuckme\.net/.*?/([0-9]+)',
-            r'youngerloverofmine\.com/.*?/([0-9]+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
+        match = self.VIDEO_ID_PATTERN.search(url)
+        return match.group(1) if match else None
     
     async def download_funscript(self, video_id: str, title: str = "", duration: int = 0) -> Optional[dict]:
         """Download and convert funscript for given video ID"""
+        # Share one download between concurrent callers so cache files are not written twice
+        task = self._in_flight.get(video_id)
+        if task is None:
+            task = asyncio.ensure_future(self._download_funscript(video_id, title, duration))
+            self._in_flight[video_id] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(video_id, None))
+        funscript = await asyncio.shield(task)
+        if funscript and (title or duration):
+            # A cached or shared result may have been produced without this caller's metadata
+            funscript = await self._fill_metadata(video_id, funscript, title, duration)
+        return funscript
+
+    async def _fill_metadata(self, video_id: str, funscript: dict, title: str, duration: int) -> dict:
+        """Fill an empty title/duration from the caller and persist it to the cache"""
+        metadata = funscript.get("metadata", {})
+        if (not title or metadata.get("title")) and (not duration or metadata.get("duration")):
+            return funscript
+        # Copy rather than mutate: the dict may be shared with other callers
+        funscript = {**funscript, "metadata": {
+            **metadata,
+            "title": metadata.get("title") or title,
+            "duration": metadata.get("duration") or duration
+        }}
         cache_file = os.path.join(self.cache_dir, f"{video_id}.funscript")
-        pattern_cache = os.path.join(self.cache_dir, f"{video_id}.pat")
-        info_cache = os.path.join(self.cache_dir, f"{video_id}.json")
+        try:
+            async with aiofiles.open(cache_file, 'wb') as f:
+                await f.write(orjson.dumps(funscript))
+            await self._mark_cached(cache_file)
+        except Exception as e:
+            logger.error(f"Error updating cached funscript metadata: {e}")
+        return funscript
+
+    async def _download_funscript(self, video_id: str, title: str, duration: int) -> Optional[dict]:
+        """Download and convert funscript, using cached files where present"""
+        cache_name = f"{video_id}.funscript"
+        pattern_name = f"{video_id}.pat"
+        info_name = f"{video_id}.json"
+        cache_file = os.path.join(self.cache_dir, cache_name)
+        pattern_cache = os.path.join(self.cache_dir, pattern_name)
+        info_cache = os.path.join(self.cache_dir, info_name)
         
         # Check if funscript already exists in cache
-        if os.path.exists(cache_file):
+        if await self.is_cached(cache_name):
             logger.info(f"Loading cached funscript for video ID {video_id}")
             try:
-                with open(cache_file, 'r') as f:
-                    return json.load(f)
+                return orjson.loads(await self._read_cached(cache_name))
             except Exception as e:
                 logger.error(f"Error loading cached funscript: {e}")
+                self._forget_cached(cache_name)
         
         try:
             # Download pattern info from Lovense API
-            if not os.path.exists(info_cache):
+            if await self.is_cached(info_name):
+                info_data = await self._read_cached(info_name)
+            else:
                 lovense_url = f"https://coll.lovense.com/coll-log/video-websites/get/pattern?videoId={video_id}&pf=Adulttime"
                 
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(lovense_url) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            with open(info_cache, 'w') as f:
-                                f.write(content)
-                        else:
-                            logger.error(f"Failed to download pattern info: HTTP {response.status}")
-                            return None
+                status, info_data = await self._download_to_file(lovense_url, info_cache)
+                if status != 200:
+                    logger.error(f"Failed to download pattern info: HTTP {status}")
+                    return None
             
-            # Load pattern info
-            with open(info_cache, 'r') as f:
-                pattern_info = json.load(f)
+            # Parse pattern info straight from the downloaded bytes
+            pattern_info = orjson.loads(info_data)
             
             if pattern_info.get('code') != 0:
                 logger.info(f"No interactive content available for video ID {video_id}")
                 return None
             
             # Download pattern data
-            if not os.path.exists(pattern_cache):
+            if await self.is_cached(pattern_name):
+                pattern_data = await self._read_cached(pattern_name)
+            else:
                 pattern_url = pattern_info['data']['pattern']
                 
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(pattern_url) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            with open(pattern_cache, 'w') as f:
-                                f.write(content)
-                        else:
-                            logger.error(f"Failed to download pattern data: HTTP {response.status}")
-                            return None
+                status, pattern_data = await self._download_to_file(pattern_url, pattern_cache)
+                if status != 200:
+                    logger.error(f"Failed to download pattern data: HTTP {status}")
+                    return None
             
             # Convert to funscript
-            funscript = await self.convert_lovense_to_funscript(pattern_cache, title, duration)
+            funscript = await self.convert_lovense_to_funscript(orjson.loads(pattern_data), title, duration)
             
             # Cache the funscript
-            with open(cache_file, 'w') as f:
-                json.dump(funscript, f)
+            async with aiofiles.open(cache_file, 'wb') as f:
+                await f.write(orjson.dumps(funscript))
+            await self._mark_cached(cache_file)
             
             logger.info(f"Successfully downloaded and converted funscript for video ID {video_id}")
             return funscript
@@ -396,20 +630,24 @@ class FunscriptDownloader:
         except Exception as e:
             logger.error(f"Error downloading funscript for video ID {video_id}: {e}")
             # Clean up potentially corrupted cache files
-            for cache_path in [info_cache, pattern_cache, cache_file]:
-                if os.path.exists(cache_path):
-                    try:
-                        os.remove(cache_path)
-                    except:
-                        pass
+            for name in [info_name, pattern_name, cache_name]:
+                self._forget_cached(name)
+                try:
+                    await aiofiles.os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
             return None
     
-    async def convert_lovense_to_funscript(self, pattern_file: str, title: str = "", duration: int = 0) -> dict:
-        """Convert Lovense pattern file to funscript format"""
-        
-        # Load Lovense actions
-        with open(pattern_file, 'r') as f:
-            lovense_actions = json.load(f)
+    async def download_many(self, videos: List[Tuple[str, str, int]]) -> List[Optional[dict]]:
+        """Download funscripts for several (video_id, title, duration) entries concurrently"""
+        async def download_one(video_id: str, title: str, duration: int) -> Optional[dict]:
+            async with self._download_sem:
+                return await self.download_funscript(video_id, title, duration)
+
+        return await asyncio.gather(*(download_one(*video) for video in videos))
+    
+    async def convert_lovense_to_funscript(self, lovense_actions: List[dict], title: str = "", duration: int = 0) -> dict:
+        """Convert parsed Lovense pattern actions to funscript format"""
         
         # Create funscript structure
         funscript = {
@@ -434,419 +672,138 @@ class FunscriptDownloader:
             "actions": []
         }
         
-        # Convert actions
-        for action in lovense_actions:
-            if action.get('t', 0) == 0:
-                continue  # Skip invalid timestamps
-            
-            # Convert values
-            marker_at = 0 if action.get('v', 0) == 0 else action['v'] * FAKTOR_CONV
-            marker_pos = action['t']  # Timestamp in milliseconds
-            
-            funscript["actions"].append({
-                "pos": int(marker_at + 0.5),
-                "at": int(marker_pos + 0.5)
-            })
-        
+        # Convert actions, skipping invalid (zero) timestamps
+        timestamps = np.fromiter((action.get('t', 0) for action in lovense_actions), dtype=np.float64, count=len(lovense_actions))
+        values = np.fromiter((action.get('v', 0) for action in lovense_actions), dtype=np.float64, count=len(lovense_actions))
+        valid = timestamps != 0
+        marker_at = np.trunc(values[valid] * FAKTOR_CONV + 0.5).astype(np.int64)
+        marker_pos = np.trunc(timestamps[valid] + 0.5).astype(np.int64)  # Timestamp in milliseconds
+
         # Sort actions by timestamp
-        funscript["actions"].sort(key=lambda x: x["at"])
+        order = np.argsort(marker_pos, kind='stable')
+        funscript["actions"] = [
+            {"pos": pos, "at": at}
+            for pos, at in zip(marker_at[order].tolist(), marker_pos[order].tolist())
+        ]
         
         logger.info(f"Converted {len(funscript['actions'])} actions to funscript")
         return funscript
 
-class AdultTimeBridge:
-    """Main bridge application"""
-
-    def __init__(self, config: dict = None):
-        # Load configuration
-        default_config = {
-            'host': 'localhost',
-            'port': 8080,
-            'buttplug_url': 'ws://localhost:6969',
-            'cache_dir': 'cache'
+# Control panel page, encoded once at import
+INDEX_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Adult Time Buttplug Bridge</title>
+    <script src="https://cdn.socket.io/4.7.4/socket.io.min.js"></script>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
+        .container { background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        h1 { color: #333; margin-bottom: 20px; }
+        .status { padding: 15px; margin: 20px 0; border-radius: 5px; font-weight: bold; }
+        .connected { background: #d4edda; color: #155724; border: 1px solid #c3e6cb; }
+        .disconnected { background: #f8d7da; color: #721c24; border: 1px solid #f5c6cb; }
+        button { padding: 12px 20px; margin: 10px 5px; border: none; border-radius: 5px; cursor: pointer; font-size: 16px; }
+        .connect-btn { background: #007bff; color: white; }
+        .connect-btn:hover { background: #0056b3; }
+        .tampermonkey-btn { background: #28a745; color: white; }
+        .tampermonkey-btn:hover { background: #1e7e34; }
+        .info { background: #e7f3ff; padding: 15px; border-left: 4px solid #007bff; margin: 20px 0; }
+        .logs { background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; max-height: 200px; overflow-y: auto; font-family: monospace; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>🔌 Adult Time Buttplug Bridge</h1>
+        <div id="status" class="status disconnected">⏸️ Disconnected from Buttplug</div>
+
+        <button class="connect-btn" onclick="connectButtplug()">🔗 Connect to Buttplug</button>
+        <button class="tampermonkey-btn" onclick="installTampermonkey()">📥 Get Tampermonkey Script</button>
+
+        <div class="info">
+            <h3>📋 Setup Instructions:</h3>
+            <ol>
+                <li>Start <strong>Intiface Central</strong> application</li>
+                <li>Click "Connect to Buttplug" above</li>
+                <li>Install the Tampermonkey script</li>
+                <li>Visit AdultTime and enjoy synchronized content!</li>
+            </ol>
+        </div>
+
+        <div class="logs" id="logs">
+            <div>Bridge server ready. Waiting for connections...</div>
+        </div>
+    </div>
+
+    <script>
+        const socket = io();
+        let buttplugConnected = false;
+
+        function addLog(message) {
+            const logs = document.getElementById('logs');
+            const time = new Date().toLocaleTimeString();
+            logs.innerHTML += `<div>[${time}] ${message}</div>`;
+            logs.scrollTop = logs.scrollHeight;
         }
-        
-        if config:
-            default_config.update(config)
-        
-        self.config = default_config
-        self.host = default_config['host']
-        self.port = default_config['port']
-        self.buttplug_url = default_config['buttplug_url']
-        
-        # Initialize components
-        self.buttplug = ButtplugConnector(self.buttplug_url)
-        self.processor = VideoEventProcessor(self.buttplug)
-        self.funscript_downloader = FunscriptDownloader(default_config['cache_dir'])
-        
-        # Setup web components
-        self.app = web.Application(middlewares=[self.cors_middleware])
-        self.sio = socketio.AsyncServer(cors_allowed_origins="*")
-        self.sio.attach(self.app)
-        
-        self.setup_routes()
-        self.setup_socketio_handlers()
-        
-        self.server_url = None
-
-    @web.middleware
-    async def cors_middleware(self, request, handler):
-        """Add CORS headers to all responses"""
-        if request.method == "OPTIONS":
-            # Handle preflight requests
-            response = web.Response()
-        else:
-            response = await handler(request)
-        
-        response.headers['Access-Control-Allow-Origin'] = '*'
-        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-        response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
-        return response
 
-    def setup_routes(self):
-        """Setup HTTP routes"""
-        self.app.router.add_get('/', self.index_handler)
-        self.app.router.add_get('/status', self.status_handler)
-        self.app.router.add_post('/api/video-event', self.video_event_handler)
-        self.app.router.add_post('/api/connect-buttplug', self.connect_buttplug_handler)
-        self.app.router.add_get('/tampermonkey.js', self.tampermonkey_script_handler)
-        self.app.router.add_get('/api/proxy-image', self.image_proxy_handler)
-        
-        # Funscript endpoints
-        self.app.router.add_post('/api/download-funscript', self.download_funscript_handler)
-        self.app.router.add_get('/api/funscript/{video_id}', self.get_funscript_handler)
-        self.app.router.add_post('/api/auto-funscript', self.auto_funscript_handler)
-
-        # Serve static files for browser extension
-        self.app.router.add_static('/static/', path='static/', name='static')
-
-    def setup_socketio_handlers(self):
-        """Setup Socket.IO event handlers"""
-
-        @self.sio.event
-        async def connect(sid, environ):
-            logger.info(f"Client connected: {sid}")
-            await self.sio.emit('status', {'connected': self.buttplug.connected}, room=sid)
-
-        @self.sio.event
-        async def video_play(sid, data):
-            await self.processor.process_play_event()
-
-        @self.sio.event
-        async def video_pause(sid, data):
-            await self.processor.process_pause_event()
-
-        @self.sio.event
-        async def scene_change(sid, data):
-            await self.processor.process_scene_change(data.get('intensity', 'medium'))
-
-        @self.sio.event
-        async def audio_level(sid, data):
-            await self.processor.process_audio_level(data.get('level', 0.0))
-
-    async def index_handler(self, request):
-        """Serve main page"""
-        html_content = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Adult Time Buttplug Bridge</title>
-            <script src="https://cdn.socket.io/4.7.4/socket.io.min.js"></script>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }
-                .container { background: white; padding: 30px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-                h1 { color: #333; margin-bottom: 20px; }
-                .status { padding: 15px; margin: 20px 0; border-radius: 5px; font-weight: bold; }
-                .connected { background: #d4edda; color: #155724; border: 1px solid #c3e6cb; }
-                .disconnected { background: #f8d7da; color: #721c24; border: 1px solid #f5c6cb; }
-                button { padding: 12px 20px; margin: 10px 5px; border: none; border-radius: 5px; cursor: pointer; font-size: 16px; }
-                .connect-btn { background: #007bff; color: white; }
-                .connect-btn:hover { background: #0056b3; }
-                .tampermonkey-btn { background: #28a745; color: white; }
-                .tampermonkey-btn:hover { background: #1e7e34; }
-                .info { background: #e7f3ff; padding: 15px; border-left: 4px solid #007bff; margin: 20px 0; }
-                .logs { background: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; max-height: 200px; overflow-y: auto; font-family: monospace; }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>🔌 Adult Time Buttplug Bridge</h1>
-                <div id="status" class="status disconnected">⏸️ Disconnected from Buttplug</div>
-                
-                <button class="connect-btn" onclick="connectButtplug()">🔗 Connect to Buttplug</button>
-                <button class="tampermonkey-btn" onclick="installTampermonkey()">📥 Get Tampermonkey Script</button>
-                
-                <div class="info">
-                    <h3>📋 Setup Instructions:</h3>
-                    <ol>
-                        <li>Start <strong>Intiface Central</strong> application</li>
-                        <li>Click "Connect to Buttplug" above</li>
-                        <li>Install the Tampermonkey script</li>
-                        <li>Visit AdultTime and enjoy synchronized content!</li>
-                    </ol>
-                </div>
-
-                <div class="logs" id="logs">
-                    <div>Bridge server ready. Waiting for connections...</div>
-                </div>
-            </div>
-
-            <script>
-                const socket = io();
-                let buttplugConnected = false;
-
-                function addLog(message) {
-                    const logs = document.getElementById('logs');
-                    const time = new Date().toLocaleTimeString();
-                    logs.innerHTML += `<div>[${time}] ${message}</div>`;
-                    logs.scrollTop = logs.scrollHeight;
-                }
-
-                socket.on('connect', function() {
-                    addLog('Connected to bridge server');
-                });
-
-                socket.on('status', function(data) {
-                    buttplugConnected = data.connected;
-                    updateStatus();
-                });
-
-                function updateStatus() {
-                    const statusEl = document.getElementById('status');
-                    if (buttplugConnected) {
-                        statusEl.textContent = '✅ Connected to Buttplug';
-                        statusEl.className = 'status connected';
-                        addLog('Buttplug connection established');
-                    } else {
-                        statusEl.textContent = '⏸️ Disconnected from Buttplug';
-                        statusEl.className = 'status disconnected';
-                    }
-                }
-
-                async function connectButtplug() {
-                    addLog('Attempting to connect to Buttplug...');
-                    try {
-                        const response = await fetch('/api/connect-buttplug', {method: 'POST'});
-                        const result = await response.json();
-                        if (result.status === 'connected') {
-                            addLog('Successfully connected to Buttplug!');
-                            buttplugConnected = true;
-                            updateStatus();
-                        } else {
-                            addLog('Failed to connect: ' + (result.error || 'Unknown error'));
-                        }
-                    } catch (e) {
-                        addLog('Connection error: ' + e.message);
-                    }
-                }
-
-                function installTampermonkey() {
-                    window.open('/tampermonkey.js', '_blank');
-                }
-
-                // Check initial status
-                fetch('/status')
-                    .then(r => r.json())
-                    .then(data => {
-                        buttplugConnected = data.buttplug_connected;
-                        updateStatus();
-                        addLog(`Bridge loaded. Buttplug: ${buttplugConnected ? 'Connected' : 'Disconnected'}`);
-                    });
-            </script>
-        </body>
-        </html>
-        """
-        return web.Response(text=html_content, content_type='text/html')
-
-    async def status_handler(self, request):
-        """API status endpoint"""
-        # Simple check - if we have devices, consider connected
-        websocket_connected = bool(self.buttplug.devices)
-        
-        return web.json_response({
-            'buttplug_connected': websocket_connected,
-            'active_devices': len(self.buttplug.devices),
-            'devices': {str(device_id): info.get('DeviceName', 'Unknown') for device_id, info in self.buttplug.devices.items()}
-        })
-
-    async def video_event_handler(self, request):
-        """Handle video events from browser extension"""
-        data = await request.json()
-        event_type = data.get('type')
-
-        if event_type == 'play':
-            await self.processor.process_play_event()
-        elif event_type == 'pause':
-            await self.processor.process_pause_event()
-        elif event_type == 'scene_change':
-            await self.processor.process_scene_change(data.get('intensity', 'medium'))
-        elif event_type == 'audio_level':
-            await self.processor.process_audio_level(data.get('level', 0.0))
-        elif event_type == 'test':
-            await self.processor.process_scene_change(data.get('intensity', 'medium'))
-            logger.info(f"Test command sent with intensity: {data.get('intensity', 'medium')}")
-
-        return web.json_response({'status': 'ok'})
-
-    async def connect_buttplug_handler(self, request):
-        """Handle manual Buttplug connection request"""
-        # Check if already connected
-        if self.buttplug.connected:
-            logger.info("Already connected to Buttplug server")
-            await self.sio.emit('status', {'connected': True})
-            return web.json_response({'status': 'connected'})
-        
-        # If not connected, attempt to connect
-        await self.buttplug.connect()
-        if self.buttplug.connected:
-            await self.buttplug.scan_devices()
-            await self.sio.emit('status', {'connected': True})
-            return web.json_response({'status': 'connected'})
-        else:
-            return web.json_response({'status': 'failed', 'error': 'Could not connect to Buttplug server'})
-
-    async def image_proxy_handler(self, request):
-        """Proxy images to bypass CORS restrictions"""
-        try:
-            # Get the image URL from query parameters
-            image_url = request.query.get('url')
-            if not image_url:
-                return web.Response(text='Missing url parameter', status=400)
-            
-            # Validate the URL is from allowed domains
-            allowed_domains = ['transform.gammacdn.com', 'cdn.adulttime.com']
-            parsed_url = urlparse(image_url)
-            if not any(domain in parsed_url.netloc for domain in allowed_domains):
-                return web.Response(text='Domain not allowed', status=403)
-            
-            # Fetch the image
-            connector = aiohttp.TCPConnector(ssl=False)  # Disable SSL verification for proxy
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(image_url) as response:
-                    if response.status != 200:
-                        return web.Response(text='Failed to fetch image', status=response.status)
-                    
-                    # Get content type
-                    content_type = response.headers.get('content-type', 'image/jpeg')
-                    image_data = await response.read()
-                    
-                    # Return the image with CORS headers
-                    return web.Response(
-                        body=image_data,
-                        content_type=content_type,
-                        headers={
-                            'Access-Control-Allow-Origin': '*',
-                            'Access-Control-Allow-Methods': 'GET',
-                            'Access-Control-Allow-Headers': 'Content-Type',
-                            'Cache-Control': 'public, max-age=3600'
-                        }
-                    )
-        except Exception as e:
-            logger.error(f"Error proxying image: {e}")
-            return web.Response(text='Internal server error', status=500)
+        socket.on('connect', function() {
+            addLog('Connected to bridge server');
+        });
 
-    async def download_funscript_handler(self, request):
-        """Download funscript for a specific video ID"""
-        try:
-            data = await request.json()
-            video_id = data.get('video_id')
-            title = data.get('title', '')
-            duration = data.get('duration', 0)
-            
-            if not video_id:
-                return web.json_response({'error': 'Missing video_id'}, status=400)
-            
-            funscript = await self.funscript_downloader.download_funscript(video_id, title, duration)
-            
-            if funscript:
-                return web.json_response({
-                    'success': True,
-                    'funscript': funscript,
-                    'actions': len(funscript.get('actions', [])),
-                    'cached': True
-                })
-            else:
-                return web.json_response({
-                    'success': False,
-                    'error': 'No interactive content available for this video'
-                }, status=404)
-                
-        except Exception as e:
-            logger.error(f"Error downloading funscript: {e}")
-            return web.json_response({'error': str(e)}, status=500)
+        socket.on('status', function(data) {
+            buttplugConnected = data.connected;
+            updateStatus();
+        });
 
-    async def get_funscript_handler(self, request):
-        """Get cached funscript for a video ID"""
-        try:
-            video_id = request.match_info['video_id']
-            cache_file = os.path.join(self.funscript_downloader.cache_dir, f"{video_id}.funscript")
-            
-            if os.path.exists(cache_file):
-                with open(cache_file, 'r') as f:
-                    funscript = json.load(f)
-                return web.json_response({
-                    'success': True,
-                    'funscript': funscript,
-                    'cached': True
-                })
-            else:
-                return web.json_response({
-                    'success': False,
-                    'error': 'Funscript not found in cache'
-                }, status=404)
-                
-        except Exception as e:
-            logger.error(f"Error getting funscript: {e}")
-            return web.json_response({'error': str(e)}, status=500)
+        function updateStatus() {
+            const statusEl = document.getElementById('status');
+            if (buttplugConnected) {
+                statusEl.textContent = '✅ Connected to Buttplug';
+                statusEl.className = 'status connected';
+                addLog('Buttplug connection established');
+            } else {
+                statusEl.textContent = '⏸️ Disconnected from Buttplug';
+                statusEl.className = 'status disconnected';
+            }
+        }
 
-    async def auto_funscript_handler(self, request):
-        """Auto-detect and download funscript from Adult Time URL"""
-        try:
-            data = await request.json()
-            url = data.get('url')
-            title = data.get('title', '')
-            duration = data.get('duration', 0)
-            
-            if not url:
-                return web.json_response({'error': 'Missing URL'}, status=400)
-            
-            # Extract video ID from URL
-            video_id = self.funscript_downloader.extract_adulttime_id(url)
-            
-            if not video_id:
-                return web.json_response({
-                    'success': False,
-                    'error': 'Could not extract video ID from URL'
-                }, status=400)
-            
-            # Try to download funscript
-            funscript = await self.funscript_downloader.download_funscript(video_id, title, duration)
-            
-            if funscript:
-                return web.json_response({
-                    'success': True,
-                    'video_id': video_id,
-                    'funscript': funscript,
-                    'actions': len(funscript.get('actions', [])),
-                    'message': f'Successfully downloaded funscript with {len(funscript.get("actions", []))} actions'
-                })
-            else:
-                return web.json_response({
-                    'success': False,
-                    'video_id': video_id,
-                    'error': 'No interactive content available for this video'
-                }, status=404)
-                
-        except Exception as e:
-            logger.error(f"Error in auto funscript download: {e}")
-            return web.json_response({'error': str(e)}, status=500)
+        async function connectButtplug() {
+            addLog('Attempting to connect to Buttplug...');
+            try {
+                const response = await fetch('/api/connect-buttplug', {method: 'POST'});
+                const result = await response.json();
+                if (result.status === 'connected') {
+                    addLog('Successfully connected to Buttplug!');
+                    buttplugConnected = true;
+                    updateStatus();
+                } else {
+                    addLog('Failed to connect: ' + (result.error || 'Unknown error'));
+                }
+            } catch (e) {
+                addLog('Connection error: ' + e.message);
+            }
+        }
 
-    async def tampermonkey_script_handler(self, request):
-        """Serve Tampermonkey script for Adult Time integration"""
-        # Use dynamic server URL
-        bridge_url = self.server_url or 'http://localhost:8080'
-        
-        script_content = '''// ==UserScript==
+        function installTampermonkey() {
+            window.open('/tampermonkey.js', '_blank');
+        }
+
+        // Check initial status
+        fetch('/status')
+            .then(r => r.json())
+            .then(data => {
+                buttplugConnected = data.buttplug_connected;
+                updateStatus();
+                addLog(`Bridge loaded. Buttplug: ${buttplugConnected ? 'Connected' : 'Disconnected'}`);
+            });
+    </script>
+</body>
+</html>
+"""
+INDEX_HTML_BYTES = INDEX_HTML.encode('utf-8')
+
+# Userscript served at /tampermonkey.js; {bridge_url} is filled in at server start
+TAMPERMONKEY_SCRIPT_TEMPLATE = '''// ==UserScript==
 // @name         Adult Time Buttplug Bridge
 // @namespace    {bridge_url}/
 // @version      2.0
@@ -1047,10 +1004,411 @@ class AdultTimeBridge:
     }
     
 })();'''
+
+class AdultTimeBridge:
+    """Main bridge application"""
+
+    # Number of serialized funscript responses kept in memory
+    FUNSCRIPT_MEM_CACHE_SIZE = 128
+
+    def __init__(self, config: dict = None):
+        # Load configuration
+        default_config = {
+            'host': 'localhost',
+            'port': 8080,
+            'buttplug_url': 'ws://localhost:6969',
+            'cache_dir': 'cache'
+        }
+        
+        if config:
+            default_config.update(config)
+        
+        self.config = default_config
+        self.host = default_config['host']
+        self.port = default_config['port']
+        self.buttplug_url = default_config['buttplug_url']
+        
+        # Initialize components
+        self.buttplug = ButtplugConnector(self.buttplug_url)
+        self.processor = VideoEventProcessor(self.buttplug)
+        self.funscript_downloader = FunscriptDownloader(default_config['cache_dir'])
+        self._proxy_session: Optional[aiohttp.ClientSession] = None
+        # One verified SSL context shared by all proxy connections (enables TLS session reuse)
+        self._ssl_ctx = ssl.create_default_context()
+        self._funscript_mem_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        
+        # Setup web components
+        self.app = web.Application(middlewares=[self.cors_middleware])
+        self.sio = socketio.AsyncServer(cors_allowed_origins="*")
+        self.sio.attach(self.app)
+        self.app.on_response_prepare.append(self._add_cors_headers)
+        self.app.on_startup.append(self._on_startup)
+        self.app.on_cleanup.append(self._on_cleanup)
+        
+        self.setup_routes()
+        self.setup_socketio_handlers()
+        
+        self.server_url = None
+        self._tampermonkey_bytes: Optional[bytes] = None
+        self._background_tasks = set()  # Keeps fire-and-forget tasks alive until they finish
+
+    @web.middleware
+    async def cors_middleware(self, request, handler):
+        """Answer CORS preflight requests"""
+        if request.method == "OPTIONS":
+            return web.Response()
+        return await handler(request)
+
+    async def _add_cors_headers(self, request, response):
+        """Add CORS headers to every response, including streamed ones, as it is prepared"""
+        response.headers.update(CORS_HEADERS)
+
+    async def _get_proxy_session(self) -> aiohttp.ClientSession:
+        """Get the pooled image proxy session, creating it on first use"""
+        if self._proxy_session is None or self._proxy_session.closed:
+            self._proxy_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    ssl=self._ssl_ctx,
+                    limit_per_host=32,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True,
+                    ttl_dns_cache=300
+                )
+            )
+        return self._proxy_session
+
+    async def close(self):
+        """Close pooled HTTP sessions"""
+        if self._proxy_session is not None:
+            await self._proxy_session.close()
+            self._proxy_session = None
+        await self.funscript_downloader.close()
+
+    async def _on_startup(self, app):
+        """Pre-create pooled resources so the first request does not pay for them"""
+        await self._get_proxy_session()
+        await self.funscript_downloader.refresh_cache_index(force=True)
+
+    async def _on_cleanup(self, app):
+        """Release pooled resources on shutdown"""
+        await self.close()
+
+    def _on_background_task_done(self, task: asyncio.Task):
+        """Forget a finished background task and log its failure, if any"""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background task failed: {task.exception()}")
+
+    def setup_routes(self):
+        """Setup HTTP routes"""
+        self.app.router.add_get('/', self.index_handler)
+        self.app.router.add_get('/status', self.status_handler)
+        self.app.router.add_post('/api/video-event', self.video_event_handler)
+        self.app.router.add_post('/api/connect-buttplug', self.connect_buttplug_handler)
+        self.app.router.add_get('/tampermonkey.js', self.tampermonkey_script_handler)
+        self.app.router.add_get('/api/proxy-image', self.image_proxy_handler)
+        
+        # Funscript endpoints
+        self.app.router.add_post('/api/download-funscript', self.download_funscript_handler)
+        self.app.router.add_get('/api/funscript/{video_id}', self.get_funscript_handler)
+        self.app.router.add_post('/api/auto-funscript', self.auto_funscript_handler)
+
+        # Serve static files for browser extension
+        self.app.router.add_static('/static/', path='static/', name='static')
+
+    def setup_socketio_handlers(self):
+        """Setup Socket.IO event handlers"""
+
+        @self.sio.event
+        async def connect(sid, environ):
+            logger.info(f"Client connected: {sid}")
+            await self.sio.emit('status', {'connected': self.buttplug.connected}, room=sid)
+
+        @self.sio.event
+        async def video_play(sid, data):
+            await self.processor.process_play_event()
+
+        @self.sio.event
+        async def video_pause(sid, data):
+            await self.processor.process_pause_event()
+
+        @self.sio.event
+        async def scene_change(sid, data):
+            await self.processor.process_scene_change(data.get('intensity', 'medium'))
+
+        @self.sio.event
+        async def audio_level(sid, data):
+            await self.processor.process_audio_level(data.get('level', 0.0))
+
+    async def index_handler(self, request):
+        """Serve main page"""
+        return web.Response(body=INDEX_HTML_BYTES, content_type='text/html', charset='utf-8')
+
+    async def status_handler(self, request):
+        """API status endpoint"""
+        # Simple check - if we have devices, consider connected
+        websocket_connected = bool(self.buttplug.devices)
+        
+        return json_response({
+            'buttplug_connected': websocket_connected,
+            'active_devices': len(self.buttplug.devices),
+            'devices': {str(device_id): info.get('DeviceName', 'Unknown') for device_id, info in self.buttplug.devices.items()}
+        })
+
+    async def video_event_handler(self, request):
+        """Handle video events from browser extension"""
+        data = await request.json(loads=orjson.loads)
+        event_type = data.get('type')
+
+        if event_type == 'play':
+            await self.processor.process_play_event()
+        elif event_type == 'pause':
+            await self.processor.process_pause_event()
+        elif event_type == 'scene_change':
+            await self.processor.process_scene_change(data.get('intensity', 'medium'))
+        elif event_type == 'audio_level':
+            await self.processor.process_audio_level(data.get('level', 0.0))
+        elif event_type == 'test':
+            await self.processor.process_scene_change(data.get('intensity', 'medium'))
+            logger.info(f"Test command sent with intensity: {data.get('intensity', 'medium')}")
+
+        return json_response({'status': 'ok'})
+
+    async def connect_buttplug_handler(self, request):
+        """Handle manual Buttplug connection request"""
+        # Check if already connected
+        if self.buttplug.connected:
+            logger.info("Already connected to Buttplug server")
+            await self.sio.emit('status', {'connected': True})
+            return json_response({'status': 'connected'})
         
-        # Replace placeholder with actual URL
-        script_content = script_content.replace('{bridge_url}', bridge_url)
-        return web.Response(text=script_content, content_type='application/javascript')
+        # If not connected, attempt to connect
+        await self.buttplug.ensure_connected()
+        if self.buttplug.connected:
+            await self.buttplug.scan_devices()
+            await self.sio.emit('status', {'connected': True})
+            return json_response({'status': 'connected'})
+        else:
+            return json_response({'status': 'failed', 'error': 'Could not connect to Buttplug server'})
+
+    async def image_proxy_handler(self, request):
+        """Proxy images to bypass CORS restrictions"""
+        proxy_response = None
+        try:
+            # Get the image URL from query parameters
+            image_url = request.query.get('url')
+            if not image_url:
+                return web.Response(text='Missing url parameter', status=400)
+            
+            # Validate the URL host exactly; substring checks would admit e.g. cdn.adulttime.com.evil.com
+            if urlparse(image_url).hostname not in ALLOWED_PROXY_HOSTS:
+                return web.Response(text='Domain not allowed', status=403)
+            
+            # Pass the browser's validators upstream so unchanged images come back as 304
+            conditional_headers = {
+                name: request.headers[name]
+                for name in ('If-None-Match', 'If-Modified-Since')
+                if name in request.headers
+            }
+            
+            # Fetch the image over a pooled keep-alive connection
+            session = await self._get_proxy_session()
+            async with session.get(image_url, headers=conditional_headers) as response:
+                validators = {
+                    name: response.headers[name]
+                    for name in ('ETag', 'Last-Modified')
+                    if name in response.headers
+                }
+                if response.status == 304:
+                    return web.Response(status=304, headers={**validators, 'Cache-Control': 'public, max-age=3600'})
+                if response.status != 200:
+                    return web.Response(text='Failed to fetch image', status=response.status)
+                
+                # Stream the image back instead of buffering it
+                proxy_response = web.StreamResponse(headers={
+                    'Content-Type': response.headers.get('content-type', 'image/jpeg'),
+                    'Cache-Control': 'public, max-age=3600',
+                    **validators
+                })
+                # aiohttp decodes compressed bodies, so the upstream length only holds for identity encoding
+                if response.content_length is not None and 'Content-Encoding' not in response.headers:
+                    proxy_response.content_length = response.content_length
+                await proxy_response.prepare(request)
+                async for chunk in response.content.iter_chunked(65536):
+                    await proxy_response.write(chunk)
+                await proxy_response.write_eof()
+                return proxy_response
+        except Exception as e:
+            logger.error(f"Error proxying image: {e}")
+            if proxy_response is not None and proxy_response.prepared:
+                # Part of the body is already sent; drop the connection rather than
+                # ending a short image the browser would treat as complete and cache
+                proxy_response.force_close()
+                raise
+            return web.Response(text='Internal server error', status=500)
+
+    async def download_funscript_handler(self, request):
+        """Download funscript for a specific video ID"""
+        try:
+            data = await request.json(loads=orjson.loads)
+            video_id = data.get('video_id')
+            title = data.get('title', '')
+            duration = data.get('duration', 0)
+            
+            if not video_id:
+                return json_response({'error': 'Missing video_id'}, status=400)
+            
+            funscript = await self.funscript_downloader.download_funscript(video_id, title, duration)
+            
+            if funscript:
+                return json_response({
+                    'success': True,
+                    'funscript': funscript,
+                    'actions': len(funscript.get('actions', [])),
+                    'cached': True
+                })
+            else:
+                return json_response({
+                    'success': False,
+                    'error': 'No interactive content available for this video'
+                }, status=404)
+                
+        except Exception as e:
+            logger.error(f"Error downloading funscript: {e}")
+            return json_response({'error': str(e)}, status=500)
+
+    async def get_funscript_handler(self, request):
+        """Get cached funscript for a video ID"""
+        try:
+            video_id = request.match_info['video_id']
+            cache_name = f"{video_id}.funscript"
+            cache_file = os.path.join(self.funscript_downloader.cache_dir, cache_name)
+            
+            not_found = json_response({
+                'success': False,
+                'error': 'Funscript not found in cache'
+            }, status=404)
+            
+            # Consult the cache index instead of stat()-ing the file on every request
+            mtime = await self.funscript_downloader.cached_mtime(cache_name)
+            if mtime is None:
+                return not_found
+            
+            # The cache file is already the funscript JSON, so raw requests are sent straight from disk
+            if request.query.get('raw') == '1':
+                return web.FileResponse(cache_file, headers={
+                    'Content-Type': 'application/json',
+                    'Cache-Control': 'public, max-age=86400'
+                })
+            
+            # Serve the serialized response from memory while the file is unchanged
+            cached = self._funscript_mem_cache.get(video_id)
+            if cached is not None and cached[0] == mtime:
+                self._funscript_mem_cache.move_to_end(video_id)
+                return web.Response(body=cached[1], content_type='application/json')
+            
+            try:
+                async with aiofiles.open(cache_file, 'rb') as f:
+                    funscript = orjson.loads(await f.read())
+            except FileNotFoundError:
+                # Removed since the index was last rebuilt
+                return not_found
+            body = orjson.dumps({
+                'success': True,
+                'funscript': funscript,
+                'cached': True
+            })
+            
+            self._funscript_mem_cache[video_id] = (mtime, body)
+            self._funscript_mem_cache.move_to_end(video_id)
+            if len(self._funscript_mem_cache) > self.FUNSCRIPT_MEM_CACHE_SIZE:
+                self._funscript_mem_cache.popitem(last=False)
+            return web.Response(body=body, content_type='application/json')
+                
+        except Exception as e:
+            logger.error(f"Error getting funscript: {e}")
+            return json_response({'error': str(e)}, status=500)
+
+    async def auto_funscript_handler(self, request):
+        """Auto-detect and download funscript from Adult Time URL"""
+        try:
+            data = await request.json(loads=orjson.loads)
+            url = data.get('url')
+            title = data.get('title', '')
+            duration = data.get('duration', 0)
+            
+            if not url:
+                return json_response({'error': 'Missing URL'}, status=400)
+            
+            # Extract video ID from URL
+            video_id = self.funscript_downloader.extract_adulttime_id(url)
+            
+            if not video_id:
+                return json_response({
+                    'success': False,
+                    'error': 'Could not extract video ID from URL'
+                }, status=400)
+            
+            # Prefetch funscripts for related videos (e.g. up next) in the background
+            # Entries are URLs or {url, title, duration} objects; the list is capped so a
+            # page cannot queue an unbounded number of Lovense fetches
+            prefetch_urls = data.get('prefetch_urls')
+            if not isinstance(prefetch_urls, list):
+                prefetch_urls = []
+            prefetch = {}
+            for entry in prefetch_urls[:FunscriptDownloader.MAX_CONCURRENT_DOWNLOADS]:
+                if isinstance(entry, str):
+                    entry = {'url': entry}
+                if not isinstance(entry, dict) or not isinstance(entry.get('url'), str):
+                    continue
+                prefetch_title = entry.get('title', '')
+                prefetch_duration = entry.get('duration', 0)
+                if not isinstance(prefetch_title, str):
+                    prefetch_title = ''
+                if not isinstance(prefetch_duration, (int, float)):
+                    prefetch_duration = 0
+                prefetch_id = self.funscript_downloader.extract_adulttime_id(entry['url'])
+                if prefetch_id and prefetch_id != video_id and prefetch_id not in prefetch:
+                    prefetch[prefetch_id] = (prefetch_id, prefetch_title, prefetch_duration)
+            if prefetch:
+                logger.info(f"Prefetching funscripts for {len(prefetch)} related video(s)")
+                task = asyncio.create_task(self.funscript_downloader.download_many(list(prefetch.values())))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._on_background_task_done)
+            
+            # Try to download funscript
+            funscript = await self.funscript_downloader.download_funscript(video_id, title, duration)
+            
+            if funscript:
+                return json_response({
+                    'success': True,
+                    'video_id': video_id,
+                    'funscript': funscript,
+                    'actions': len(funscript.get('actions', [])),
+                    'message': f'Successfully downloaded funscript with {len(funscript.get("actions", []))} actions'
+                })
+            else:
+                return json_response({
+                    'success': False,
+                    'video_id': video_id,
+                    'error': 'No interactive content available for this video'
+                }, status=404)
+                
+        except Exception as e:
+            logger.error(f"Error in auto funscript download: {e}")
+            return json_response({'error': str(e)}, status=500)
+
+    async def tampermonkey_script_handler(self, request):
+        """Serve Tampermonkey script for Adult Time integration"""
+        if self._tampermonkey_bytes is None:
+            # Server not started yet; fall back to the default URL
+            self._tampermonkey_bytes = TAMPERMONKEY_SCRIPT_TEMPLATE.replace('{bridge_url}', 'http://localhost:8080').encode('utf-8')
+        return web.Response(
+            body=self._tampermonkey_bytes,
+            content_type='application/javascript',
+            charset='utf-8',
+            headers={'Cache-Control': 'public, max-age=86400'}
+        )
 
     async def start_server(self, host=None, port=None):
         """Start the bridge server with config support and error handling"""
@@ -1058,46 +1416,35 @@ class AdultTimeBridge:
         host = host or self.config.get('bridge', {}).get('host', 'localhost')
         port = port or self.config.get('bridge', {}).get('port', 8080)
         
-        # Check if port is available
-        if not check_port_available(host, port):
-            logger.warning(f"Port {port} is already in use")
-            try:
-                port = find_available_port(host, port + 1)
-                logger.info(f"Using alternative port: {port}")
-            except RuntimeError as e:
-                logger.error(f"Could not find available port: {e}")
-                raise
-        
-        logger.info(f"Starting server on {host}:{port}")
-
         # Try to connect to Buttplug (non-blocking)
-        await self.buttplug.connect()
+        await self.buttplug.ensure_connected()
         if self.buttplug.connected:
             await self.buttplug.scan_devices()
         else:
             logger.info("Starting server without Buttplug connection - you can connect later")
 
-        # Start web server with error handling
+        # Start web server, binding directly so there is no probe/bind race
+        runner = web.AppRunner(self.app)
+        await runner.setup()
         try:
-            runner = web.AppRunner(self.app)
-            await runner.setup()
-            site = web.TCPSite(runner, host, port)
-            await site.start()
-
-            # Store the server URL for script generation
-            self.server_url = f"http://{host}:{port}"
-            
-            logger.info(f"🚀 Bridge server running on {self.server_url}")
-            if not self.buttplug.connected:
-                logger.info("To connect to Buttplug devices:")
-                logger.info("1. Start Intiface Central")
-                logger.info(f"2. Visit {self.server_url} and click 'Connect to Buttplug'")
-            return runner
-            
-        except OSError as e:
-            if e.errno == 48:  # Address already in use
-                logger.error(f"Port {port} is still in use. Please check if another instance is running.")
+            bound_port = await start_site(runner, host, port)
+        except Exception as e:
+            logger.error(f"Could not start server: {e}")
+            await runner.cleanup()
             raise
+        if bound_port != port:
+            logger.info(f"Using alternative port: {bound_port}")
+
+        # Store the server URL for script generation
+        self.server_url = f"http://{host}:{bound_port}"
+        self._tampermonkey_bytes = TAMPERMONKEY_SCRIPT_TEMPLATE.replace('{bridge_url}', self.server_url).encode('utf-8')
+        
+        logger.info(f"🚀 Bridge server running on {self.server_url}")
+        if not self.buttplug.connected:
+            logger.info("To connect to Buttplug devices:")
+            logger.info("1. Start Intiface Central")
+            logger.info(f"2. Visit {self.server_url} and click 'Connect to Buttplug'")
+        return runner
 
 async def main():
     """Main entry point with improved error handling"""
@@ -1109,12 +1456,18 @@ async def main():
         bridge = AdultTimeBridge(config)
         runner = await bridge.start_server()
 
+        # Keep the server running until SIGINT/SIGTERM without waking the loop
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except NotImplementedError:
+                pass  # Windows: Ctrl+C raises KeyboardInterrupt instead
+
         try:
             logger.info("Bridge is running. Press Ctrl+C to stop.")
-            # Keep the server running
-            while True:
-                await asyncio.sleep(1)
-        except KeyboardInterrupt:
+            await stop_event.wait()
             logger.info("Received shutdown signal...")
         finally:
             logger.info("Cleaning up...")
@@ -1130,6 +1483,14 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Prefer the libuv-based event loop where available
+    if sys.platform != 'win32':
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt: